@@ -1,8 +1,77 @@
-import speech_recognition as sr
+import ahocorasick
+import numpy as np
+import pvporcupine
+import pyaudio
+import webrtcvad
+from faster_whisper import WhisperModel
 import pyttsx3
-import requests
+import httpx
+import orjson
 import logging
+import asyncio
+import atexit
+import collections
+import concurrent.futures
+import ctypes
+import hashlib
+import itertools
+import os
+import queue
+import re
+import shutil
+import struct
 import sys
+import threading
+import time
+import wave
+
+# A sentence is complete once its terminal punctuation is followed by whitespace
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+|\n+')
+
+# Spoken commands and what they do. A command has to end the utterance and may only follow a couple of
+# filler words ("thanks, goodbye Cortana"), so a question that merely mentions one still goes to the model.
+COMMAND_PHRASES = (
+    ("goodbye cortana", "exit"),
+    ("stop listening", "pause"),
+)
+MAX_COMMAND_PREFIX_WORDS = 2
+
+# Whisper punctuates its transcripts ("Goodbye, Cortana."), which is dropped before matching commands
+PUNCTUATION = re.compile(r"[^\w\s']+")
+
+# Porcupine, webrtcvad and whisper all work on 16 kHz mono 16-bit audio
+SAMPLE_RATE = 16000
+VAD_FRAME_SAMPLES = SAMPLE_RATE * 20 // 1000
+
+# A voiced frame only counts as speech when it's this much louder than the running noise floor
+NOISE_GATE_RATIO = 2.0
+NOISE_FLOOR_SMOOTHING = 0.98
+# Frames above the gate still feed the floor, just slowly, so steady noise the VAD mistakes for speech is learnt
+NOISE_FLOOR_LOUD_SMOOTHING = 0.999
+# Until this many frames have been seen, every frame uses the fast rate so the floor settles quickly
+NOISE_FLOOR_SETTLE_FRAMES = 50
+
+THREAD_PRIORITY_TIME_CRITICAL = 15
+
+# Fixed phrases are rendered to WAV once per voice and played back from disk instead of being synthesized every time
+CANNED_PHRASES = (
+    "Hi, your voice assistant is ready.",
+    "Hey there.",
+    "How can I help?",
+    "Listening timeout. Please try again.",
+    "Sorry, I couldn't understand that.",
+    "Goodbye! Shutting down.",
+    "Sorry, I'm experiencing technical difficulties.",
+    "An unexpected error occurred.",
+)
+# An utterance that hasn't reported finishing by then is given up on: a base allowance plus time per word
+UTTERANCE_TIMEOUT_BASE = 5.0
+UTTERANCE_TIMEOUT_PER_WORD = 1.0
+
+SPEECH_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cortana_cache")
+
+# Porcupine can't start without these; see the Setup section of the README
+REQUIRED_ENV_VARS = ("PICOVOICE_ACCESS_KEY", "CORTANA_KEYWORD_PATH")
 
 class VoiceAssistant:
     def __init__(self):
@@ -10,115 +79,522 @@ class VoiceAssistant:
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
 
-        # Initialize the recognizer and microphone
-        self.recognizer = sr.Recognizer()
-        self.microphone = sr.Microphone()
+        # Fail before loading any models if the wake-word setup hasn't been done
+        missing = [name for name in REQUIRED_ENV_VARS if not os.environ.get(name)]
+        if missing:
+            sys.exit(f"Missing environment variable(s): {', '.join(missing)}. "
+                     "See the Setup section of README.md for how to configure the wake word.")
 
-        # Initialize the speech engine
-        self.engine = pyttsx3.init()
-        self.engine.setProperty('rate', 150)
+        # Transcribe locally instead of round-tripping every utterance to Google
+        self.stt = WhisperModel("tiny.en", device="cpu", compute_type="int8")
 
-        # Get available voices and set the desired one
-        voices = self.engine.getProperty('voices')
-        self.engine.setProperty('voice', voices[1].id)  # Use voices[1] for the second voice in the list
+        # Spot the wake word on-device so ambient speech never reaches the recognizer.
+        # "Hey Cortana" isn't a built-in Porcupine keyword, so it's loaded from a custom .ppn file.
+        self.porcupine = pvporcupine.create(access_key=os.environ["PICOVOICE_ACCESS_KEY"],
+                                            keyword_paths=[os.environ["CORTANA_KEYWORD_PATH"]])
+        atexit.register(self.porcupine.delete)
+
+        # All command phrases are matched in a single pass over the transcript. Phrases and transcript are
+        # padded with spaces so that only whole words match ("nonstop listening" isn't "stop listening").
+        self._commands = ahocorasick.Automaton()
+        for phrase, action in COMMAND_PHRASES:
+            self._commands.add_word(f" {phrase} ", (action, len(phrase.split())))
+        self._commands.make_automaton()
+
+        # One input stream stays open for the assistant's lifetime; utterances are cut out of it with a VAD
+        self._pa = pyaudio.PyAudio()
+        self._stream = self._pa.open(rate=SAMPLE_RATE,
+                                     channels=1,
+                                     format=pyaudio.paInt16,
+                                     input=True,
+                                     frames_per_buffer=self.porcupine.frame_length)
+        atexit.register(self._close_audio)
+        self._vad = webrtcvad.Vad(2)
+        self._noise_rms = None
+        self._noise_frames = 0
+
+        # The capture thread only moves raw PCM into a bounded queue; wake-word spotting, VAD and whisper
+        # run on their own worker so they can never stall the microphone or the event loop
+        self._frames = queue.Queue(maxsize=32)
+        self._audio_buffer = bytearray()
+        self._stop_capture = threading.Event()
+        self._capture_thread = None
+        self._stt_pool = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="stt")
+
+        # Speech runs on one long-lived thread so replies can be spoken while Ollama is still generating.
+        # pyttsx3 is not thread-safe, so the engine is created and only ever driven on that thread.
+        self._speech_queue = queue.Queue()
+        self._utterance = None
+        self._utterance_name = None
+        self._utterance_ids = itertools.count()
+        self._utterance_deadline = None
+        # macOS's nsss driver only reports finished utterances from a Cocoa run loop, which iterate() doesn't run,
+        # so there each utterance still goes through runAndWait()
+        self._external_loop = sys.platform != "darwin"
+        self._last_speech = None
+        self._canned = {}
+        engine_ready = concurrent.futures.Future()
+        threading.Thread(target=self._tts_pump, args=(engine_ready,), name="tts", daemon=True).start()
+        engine_ready.result()
 
         # Ollama API settings
         self.ollama_url = 'http://localhost:11434/api/chat'
         self.model = "mistral"
+        self.keep_alive = "30m"  # Keep the weights resident between queries instead of Ollama's default 5 minutes
+
+        # Keep the connection to Ollama alive across turns instead of reconnecting for every query
+        self._http = httpx.AsyncClient(timeout=10.0, headers={"Content-Type": "application/json"})
+        self._warm_up_task = None
 
         # Conversation history settings
-        self.conversation_history = []
         self.max_history_length = 5
+        self.conversation_history = collections.deque(maxlen=self.max_history_length)
 
+        # Turns that fall out of the history window are folded into a short running summary in the background
+        self._summary = None
+        self._forgotten = []
+        self._summary_task = None
 
-    def speak(self, text):
-        try:
-            self.engine.say(text)
+
+    def _close_audio(self):
+        self._stream.close()
+        self._pa.terminate()
+
+    def _init_engine(self):
+        # Initialize the speech engine
+        engine = pyttsx3.init()
+        engine.setProperty('rate', 150)
+
+        # Get available voices and set the desired one
+        voices = engine.getProperty('voices')
+        engine.setProperty('voice', voices[1].id)  # Use voices[1] for the second voice in the list
+        return engine
+
+    def _prepare_canned_speech(self):
+        voice = f"{self.engine.getProperty('voice')}:{self.engine.getProperty('rate')}"
+        cache_dir = os.path.join(SPEECH_CACHE_DIR, hashlib.sha1(voice.encode()).hexdigest())
+        os.makedirs(cache_dir, exist_ok=True)
+
+        # Some drivers (e.g. macOS) don't write WAV; once that's known, don't render again on every start
+        unsupported_marker = os.path.join(cache_dir, "unsupported")
+        if os.path.exists(unsupported_marker):
+            return
+
+        # pyttsx3's espeak driver writes files through ffmpeg, so without it nothing would ever be cached
+        if sys.platform.startswith("linux") and shutil.which("ffmpeg") is None:
+            self.logger.warning("ffmpeg not found; fixed phrases will be synthesized live")
+            return
+
+        paths = {text: os.path.join(cache_dir, f"{hashlib.sha1(text.encode()).hexdigest()}.wav") for text in CANNED_PHRASES}
+        missing = [text for text, path in paths.items() if not os.path.exists(path)]
+        # Render next to the final file and rename it into place, so an interrupted render never looks cached
+        for text in missing:
+            self.engine.save_to_file(text, f"{paths[text]}.tmp.wav")
+        if missing:
             self.engine.runAndWait()
+            for text in missing:
+                if os.path.exists(f"{paths[text]}.tmp.wav"):
+                    os.replace(f"{paths[text]}.tmp.wav", paths[text])
+
+        not_rendered = [text for text, path in paths.items() if not os.path.exists(path)]
+        if not_rendered:
+            self.logger.warning(f"{len(not_rendered)} fixed phrase(s) could not be rendered; they will be synthesized live")
+
+        for text, path in paths.items():
+            if text in not_rendered:
+                continue
+
+            with open(path, "rb") as f:
+                if f.read(4) != b"RIFF":
+                    self.logger.warning("The speech driver doesn't write WAV files; fixed phrases will be synthesized live")
+                    open(unsupported_marker, "w").close()
+                    self._canned.clear()
+                    return
+
+            try:
+                with wave.open(path, "rb") as wav:
+                    self._canned[text] = (wav.getsampwidth(), wav.getnchannels(), wav.getframerate(),
+                                          wav.readframes(wav.getnframes()))
+            except (EOFError, wave.Error) as e:
+                # A WAV that doesn't parse is corrupt, so drop it and render it again on the next start
+                self.logger.warning(f"Can't use cached speech for {text!r}: {e}")
+                os.remove(path)
+
+    def _play(self, sample_width, channels, rate, frames):
+        stream = self._pa.open(format=self._pa.get_format_from_width(sample_width),
+                               channels=channels,
+                               rate=rate,
+                               output=True)
+        try:
+            stream.write(frames)
+        finally:
+            stream.close()
+
+    def _tts_pump(self, engine_ready):
+        try:
+            self.engine = self._init_engine()
+        except Exception as e:
+            engine_ready.set_exception(e)
+            return
+        engine_ready.set_result(None)
+
+        try:
+            self._prepare_canned_speech()
+        except Exception as e:
+            self.logger.error(f"Couldn't prepare cached speech: {e}")
+
+        # Drive the engine's event loop ourselves instead of spinning up runAndWait() for every utterance
+        if self._external_loop:
+            self.engine.connect('finished-utterance', self._on_utterance_finished)
+            self.engine.startLoop(False)
+
+        while True:
+            if self._utterance is None:
+                self._start_utterance(*self._speech_queue.get())
+                continue
+
+            try:
+                self.engine.iterate()
+            except Exception as e:
+                self.logger.error(f"Speech synthesis error: {e}")
+                self._on_utterance_finished(self._utterance_name, False)
+                continue
+
+            if time.monotonic() > self._utterance_deadline:
+                # Never leave the dialog waiting on an utterance the driver lost track of
+                self.logger.warning("Speech didn't finish in time; moving on")
+                self._on_utterance_finished(self._utterance_name, False)
+                try:
+                    self.engine.stop()
+                except Exception as e:
+                    self.logger.error(f"Speech synthesis error: {e}")
+            time.sleep(0.01)
+
+    def _start_utterance(self, text, future):
+        try:
+            if text in self._canned:
+                self._play(*self._canned[text])
+                future.set_result(None)
+            elif not self._external_loop:
+                self.engine.say(text)
+                self.engine.runAndWait()
+                future.set_result(None)
+            else:
+                self._utterance = future
+                self._utterance_name = f"utterance-{next(self._utterance_ids)}"
+                self._utterance_deadline = (time.monotonic() + UTTERANCE_TIMEOUT_BASE
+                                            + UTTERANCE_TIMEOUT_PER_WORD * len(text.split()))
+                self.engine.say(text, self._utterance_name)
         except Exception as e:
             self.logger.error(f"Speech synthesis error: {e}")
+            self._utterance = None
+            future.set_result(None)
 
-    def get_ollama_response(self, query):
-        self.conversation_history.append({"role": "user", "content": query})
-        
-        if len(self.conversation_history) > self.max_history_length:
-            self.conversation_history.pop(0)
+    def _on_utterance_finished(self, name, completed):
+        # The driver can still report an utterance we already gave up on after an iterate() error
+        if self._utterance is None or name != self._utterance_name:
+            return
+
+        utterance, self._utterance = self._utterance, None
+        if not utterance.done():
+            utterance.set_result(None)
+
+    def speak(self, text):
+        """Queue text for the TTS thread and return a future that resolves once it has been spoken."""
+        future = concurrent.futures.Future()
+        self._speech_queue.put((text, future))
+        self._last_speech = future
+        return future
+
+    async def _wait_for_speech(self):
+        # Don't listen while the assistant is still talking, or it will hear itself
+        if self._last_speech is not None:
+            await asyncio.wrap_future(self._last_speech)
+
+    def _remember(self, message):
+        if len(self.conversation_history) == self.conversation_history.maxlen:
+            self._forgotten.append(self.conversation_history[0])
+        self.conversation_history.append(message)
+
+    async def _warm_up(self):
+        # A chat request without messages makes Ollama load the model without generating anything
+        payload = {"model": self.model, "messages": [], "keep_alive": self.keep_alive}
+
+        try:
+            response = await self._http.post(self.ollama_url, content=orjson.dumps(payload), timeout=60)
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            self.logger.warning(f"Ollama warm-up failed: {e}")
+
+    async def _summarize(self, turns):
+        transcript = "\n".join(f"{turn['role']}: {turn['content']}" for turn in turns)
+        if self._summary:
+            transcript = f"Earlier summary: {self._summary}\n{transcript}"
 
         payload = {
             "model": self.model,
-            "messages": self.conversation_history,
+            "keep_alive": self.keep_alive,
+            "messages": [{"role": "user", "content": f"Summarize this conversation in at most 40 words:\n{transcript}"}],
             "stream": False
         }
-        
+
         try:
-            response = requests.post(self.ollama_url, 
-                                     json=payload, 
-                                     timeout=10)
+            response = await self._http.post(self.ollama_url, content=orjson.dumps(payload), timeout=30)
             response.raise_for_status()
-            assistant_response = response.json()['message']['content']
-            
-            self.conversation_history.append({"role": "assistant", "content": assistant_response})
-            
-            return assistant_response
-        
-        except requests.RequestException as e:
+            self._summary = orjson.loads(response.content)['message']['content'].strip()
+        except (httpx.HTTPError, orjson.JSONDecodeError, KeyError, TypeError) as e:
+            self.logger.error(f"Ollama summary error: {e}")
+            # Put the turns back so the next summary folds them in instead of losing them
+            self._forgotten[:0] = turns
+
+    async def get_ollama_response(self, query):
+        """Stream the reply from Ollama, yielding it one sentence at a time."""
+        self._remember({"role": "user", "content": query})
+
+        messages = list(self.conversation_history)
+        if self._summary:
+            messages.insert(0, {"role": "system", "content": f"Summary of the earlier conversation: {self._summary}"})
+
+        payload = {
+            "model": self.model,
+            "keep_alive": self.keep_alive,
+            "messages": messages,
+            "stream": True
+        }
+
+        reply = []
+        pending = ""
+
+        try:
+            async with self._http.stream("POST", self.ollama_url, content=orjson.dumps(payload)) as response:
+                response.raise_for_status()
+
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+
+                    token = orjson.loads(line).get('message', {}).get('content', '')
+                    reply.append(token)
+
+                    # Hand off every finished sentence so speech can start while the model keeps generating
+                    *sentences, pending = SENTENCE_BOUNDARY.split(pending + token)
+                    for sentence in map(str.strip, sentences):
+                        if sentence:
+                            yield sentence
+
+            pending = pending.strip()
+            if pending:
+                yield pending
+
+            self._remember({"role": "assistant", "content": "".join(reply)})
+
+            # Only one summary runs at a time; anything forgotten meanwhile is picked up after the next turn
+            if self._forgotten and (self._summary_task is None or self._summary_task.done()):
+                turns, self._forgotten = self._forgotten, []
+                self._summary_task = asyncio.create_task(self._summarize(turns))
+
+        except httpx.HTTPError as e:
             self.logger.error(f"Ollama request error: {e}")
-            return "Sorry, I'm experiencing technical difficulties."
+            yield "Sorry, I'm experiencing technical difficulties."
+
+    def transcribe(self, pcm):
+        samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+        segments, _ = self.stt.transcribe(samples,
+                                          language="en",
+                                          beam_size=1,
+                                          vad_filter=True)
+        return " ".join(filter(None, (segment.text.strip() for segment in segments)))
+
+    def _match_command(self, text):
+        words = PUNCTUATION.sub(" ", text.lower()).split()
+        transcript = f" {' '.join(words)} "
+
+        for end, (action, phrase_length) in self._commands.iter(transcript):
+            if end == len(transcript) - 1 and len(words) - phrase_length <= MAX_COMMAND_PREFIX_WORDS:
+                return action
+        return None
+
+    def _raise_capture_priority(self):
+        # Realtime scheduling needs CAP_SYS_NICE on Linux, so running without it is only worth a warning
+        try:
+            if hasattr(os, "sched_setscheduler"):
+                os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(20))
+            elif sys.platform == "win32":
+                kernel32 = ctypes.windll.kernel32
+                kernel32.SetThreadPriority(kernel32.GetCurrentThread(), THREAD_PRIORITY_TIME_CRITICAL)
+        except OSError as e:
+            self.logger.warning(f"Could not raise audio capture priority: {e}")
+
+    def _capture(self):
+        self._raise_capture_priority()
+
+        frame_length = self.porcupine.frame_length
+        try:
+            while not self._stop_capture.is_set():
+                frame = self._stream.read(frame_length, exception_on_overflow=False)
+                try:
+                    self._frames.put_nowait(frame)
+                except queue.Full:
+                    # Nobody is listening right now; drop the frame rather than stop draining the device
+                    pass
+        except OSError as e:
+            self.logger.error(f"Audio capture error: {e}")
+        finally:
+            # Let the STT worker see that no more audio is coming, however capture ended
+            self._stop_capture.set()
+
+    def _read(self, num_samples):
+        num_bytes = num_samples * 2
+        while len(self._audio_buffer) < num_bytes:
+            try:
+                self._audio_buffer.extend(self._frames.get(timeout=0.5))
+            except queue.Empty:
+                if self._stop_capture.is_set():
+                    raise EOFError("Audio capture has stopped")
+
+        frame = bytes(self._audio_buffer[:num_bytes])
+        del self._audio_buffer[:num_bytes]
+        return frame
+
+    def _discard_buffered_audio(self):
+        # Drop whatever was captured while the assistant was busy talking or thinking
+        self._audio_buffer.clear()
+        try:
+            while True:
+                self._frames.get_nowait()
+        except queue.Empty:
+            pass
+
+    def _on_stt_worker(self, fn, *args):
+        return asyncio.wrap_future(self._stt_pool.submit(fn, *args))
+
+    def wait_for_wake_word(self):
+        frame_length = self.porcupine.frame_length
+        self._discard_buffered_audio()
+
+        while True:
+            pcm = self._read(frame_length)
+            self._update_noise_floor(pcm)
+            if self.porcupine.process(struct.unpack_from(f"{frame_length}h", pcm)) >= 0:
+                return
+
+    def _update_noise_floor(self, frame):
+        """Fold a frame into the running noise floor and return whether it was above the gate."""
+        # The floor is an EMA over every frame we read, including the wake-word loop, so no calibration pass is needed
+        rms = float(np.sqrt(np.mean(np.square(np.frombuffer(frame, dtype=np.int16), dtype=np.float32))))
+        if self._noise_rms is None:
+            # PortAudio often hands back silent frames right after opening, which would pin the floor at zero
+            if rms > 0:
+                self._noise_rms = rms
+            return False
+
+        self._noise_frames += 1
+        loud = rms > NOISE_GATE_RATIO * self._noise_rms
+        settled = self._noise_frames > NOISE_FLOOR_SETTLE_FRAMES
+        smoothing = NOISE_FLOOR_LOUD_SMOOTHING if loud and settled else NOISE_FLOOR_SMOOTHING
+        self._noise_rms = smoothing * self._noise_rms + (1 - smoothing) * rms
+        return loud
+
+    def _is_speech(self, frame):
+        loud = self._update_noise_floor(frame)
+        return loud and self._vad.is_speech(frame, SAMPLE_RATE)
+
+    def listen(self, timeout=5, pause_duration=0.8, phrase_time_limit=15):
+        """Record one utterance from the open stream and return its PCM, or None if nobody spoke in time."""
+        frames_per_second = SAMPLE_RATE // VAD_FRAME_SAMPLES
+        self._discard_buffered_audio()
+
+        # Speech starts once most of the last 200 ms is voiced; that window is kept so the first word isn't clipped
+        window = collections.deque(maxlen=frames_per_second // 5)
+        for _ in range(timeout * frames_per_second):
+            frame = self._read(VAD_FRAME_SAMPLES)
+            window.append((frame, self._is_speech(frame)))
+            if sum(voiced for _, voiced in window) > 0.6 * window.maxlen:
+                break
+        else:
+            return None
 
-    def listen_for_input(self, wake_word="hey cortana"):
+        utterance = bytearray(b"".join(frame for frame, _ in window))
+        silent_frames = 0
+        for _ in range(phrase_time_limit * frames_per_second):
+            frame = self._read(VAD_FRAME_SAMPLES)
+            utterance.extend(frame)
+
+            silent_frames = 0 if self._is_speech(frame) else silent_frames + 1
+            if silent_frames >= pause_duration * frames_per_second:
+                break
+
+        return bytes(utterance)
+
+    async def listen_for_input(self):
         while True:
             try:
-                audio = None
-                with self.microphone as source:
-                    self.recognizer.adjust_for_ambient_noise(source, duration=1)
-                    self.logger.info("Listening for wake word...")
-                    audio = self.recognizer.listen(source)
-                
-                if audio:
-                    text = self.recognizer.recognize_google(audio).lower()
-                    self.logger.info(f"Heard: {text}")
-                    
-                    if wake_word in text:
-                        self.speak("Hey there.")
-                        self.process_user_input()
-
-                    if "goodbye cortana" in text:
-                        self.speak("Goodbye! Shutting down.")
-                        sys.exit()  # Exit the script
+                await self._wait_for_speech()
+                self.logger.info("Listening for wake word...")
+                await self._on_stt_worker(self.wait_for_wake_word)
+
+                self.speak("Hey there.")
+                await self.process_user_input()
             
-            except sr.UnknownValueError:
-                continue
+            except EOFError:
+                # The microphone is gone; there's nothing left to listen to
+                raise
             except Exception as e:
                 self.logger.error(f"Listening error: {e}")
 
-    def process_user_input(self):
+    async def process_user_input(self):
         try:
-            audio = None
-            with self.microphone as source:
-                self.recognizer.adjust_for_ambient_noise(source, duration=1)
-                self.speak("How can I help?")
-                audio = self.recognizer.listen(source, timeout=5)
+            await asyncio.wrap_future(self.speak("How can I help?"))
+            audio = await self._on_stt_worker(self.listen, 5)
+
+            if audio is None:
+                self.speak("Listening timeout. Please try again.")
+                return
+
+            user_query = await self._on_stt_worker(self.transcribe, audio)
+            if not user_query:
+                self.speak("Sorry, I couldn't understand that.")
+                return
+
+            self.logger.info(f"User query: {user_query}")
+
+            command = self._match_command(user_query)
+            if command == "exit":
+                await asyncio.wrap_future(self.speak("Goodbye! Shutting down."))
+                sys.exit()  # Exit the script
+            if command == "pause":
+                self.logger.info("Paused until the next wake word")
+                return
             
-            if audio:
-                user_query = self.recognizer.recognize_google(audio)
-                self.logger.info(f"User query: {user_query}")
-                
-                response = self.get_ollama_response(user_query)
-                self.speak(response)
+            async for sentence in self.get_ollama_response(user_query):
+                self.speak(sentence)
         
-        except sr.WaitTimeoutError:
-            self.speak("Listening timeout. Please try again.")
-        except sr.UnknownValueError:
-            self.speak("Sorry, I couldn't understand that.")
+        except EOFError:
+            raise
         except Exception as e:
             self.logger.error(f"Input processing error: {e}")
             self.speak("An unexpected error occurred.")
 
-    def run(self):
+    async def _main(self):
+        self._capture_thread = threading.Thread(target=self._capture, name="capture", daemon=True)
+        self._capture_thread.start()
+
         try:
             self.logger.info("Voice Assistant Initialized")
             self.speak("Hi, your voice assistant is ready.")
-            self.listen_for_input()
+
+            # Load the model while the greeting plays so the first question doesn't pay for it
+            self._warm_up_task = asyncio.create_task(self._warm_up())
+            await self.listen_for_input()
+        finally:
+            # The stream is closed at exit, so make sure nothing is still reading from it by then
+            self._stop_capture.set()
+            self._capture_thread.join()
+            await self._http.aclose()
+
+    def run(self):
+        try:
+            asyncio.run(self._main())
         except Exception as e:
             self.logger.critical(f"Critical error in voice assistant: {e}")
 